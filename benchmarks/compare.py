@@ -0,0 +1,64 @@
+import json
+import argparse
+
+# Lower is better for latencies, higher is better for throughput
+LATENCY_KEYS = ("p50", "p95")
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1):
+    """
+    Compare two benchmark reports.
+    :param threshold: Allowed relative slowdown (0.1 = 10%) before a result counts as a regression.
+    :return: List of (result name, metric, baseline value, current value) regressions.
+             Results missing from the current report are listed with metric "missing".
+    """
+    baseline_results = {r["name"]: r for r in baseline["results"]}
+    current_names = {r["name"] for r in current["results"]}
+    regressions = [(name, "missing", "present", None) for name in baseline_results if name not in current_names]
+    for result in current["results"]:
+        previous = baseline_results.get(result["name"])
+        if previous is None:
+            continue
+
+        # Failures make a run look faster, so any increase is a regression regardless of threshold
+        if result.get("errors", 0) > previous.get("errors", 0):
+            regressions.append((result["name"], "errors", previous.get("errors", 0), result["errors"]))
+
+        for key in LATENCY_KEYS:
+            old = previous.get("latency_ms", {}).get(key)
+            new = result.get("latency_ms", {}).get(key)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append((result["name"], f"latency_ms.{key}", old, new))
+
+        for key, new in result.get("throughput", {}).items():
+            old = previous.get("throughput", {}).get(key)
+            if old and new < old / (1 + threshold):
+                regressions.append((result["name"], f"throughput.{key}", old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", help="Results of the reference version")
+    parser.add_argument("current", help="Results of the version under test")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed relative slowdown (default 0.1)")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    regressions = compare(baseline, current, args.threshold)
+    for name, metric, old, new in regressions:
+        if metric == "missing":
+            print(f"REGRESSION {name}: missing from {args.current}")
+        else:
+            print(f"REGRESSION {name} {metric}: {old} -> {new}")
+    if not regressions:
+        print("No regressions found.")
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
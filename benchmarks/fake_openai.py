@@ -0,0 +1,299 @@
+import time
+import uuid
+import base64
+import random
+import hashlib
+import argparse
+import threading
+import numpy as np
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+
+
+def fake_embedding(text: str, dim: int = 1536):
+    """Deterministic unit-length embedding for a text (same text -> same vector)."""
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def count_tokens(text: str):
+    """Rough token estimate (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class FakeOpenAISettings:
+    """Behaviour knobs for the fake OpenAI server."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rate_limit: float = 0,
+                 embedding_dim: int = 1536, run_polls: int = 1, seed: int = 0):
+        """
+        :param latency: Seconds added to every response.
+        :param jitter: Extra random latency, uniform in [0, jitter] seconds.
+        :param rate_limit: Requests per second before answering 429 (0 disables limiting).
+        :param embedding_dim: Size of the returned embedding vectors.
+        :param run_polls: Number of run status polls before a run reports "completed".
+        :param seed: Seed for the latency jitter.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.embedding_dim = embedding_dim
+        self.run_polls = run_polls
+        self.seed = seed
+
+
+class _TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second (burst of `rate`)."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token; returns 0 on success, else the seconds until one is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+def create_app(settings: FakeOpenAISettings):
+    """Create a Flask app implementing the subset of the OpenAI API used by the analyzer."""
+    app = Flask(__name__)
+    bucket = _TokenBucket(settings.rate_limit) if settings.rate_limit else None
+    rng = random.Random(settings.seed)
+    rng_lock = threading.Lock()
+    state_lock = threading.Lock()
+    assistants, threads, runs = {}, {}, {}
+    app.config["stats"] = stats = {"requests": 0, "rate_limited": 0}
+
+    def new_id(prefix):
+        return f"{prefix}_{uuid.uuid4().hex[:24]}"
+
+    def text_message(thread_id, role, text, assistant_id=None, run_id=None):
+        return {
+            "id": new_id("msg"),
+            "object": "thread.message",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "role": role,
+            "status": "completed",
+            "assistant_id": assistant_id,
+            "run_id": run_id,
+            "attachments": [],
+            "metadata": {},
+            "content": [{"type": "text", "text": {"value": text, "annotations": []}}],
+        }
+
+    def error(status, message, error_type):
+        return jsonify({"error": {"message": message, "type": error_type, "param": None, "code": error_type}}), status
+
+    @app.before_request
+    def simulate_latency_and_limits():
+        """Apply the configured latency, then reject the request if over the rate limit."""
+        with state_lock:
+            stats["requests"] += 1
+        delay = settings.latency
+        if settings.jitter:
+            with rng_lock:
+                delay += rng.uniform(0, settings.jitter)
+        if delay:
+            time.sleep(delay)
+
+        if bucket is not None:
+            retry_after = bucket.try_acquire()
+            if retry_after:
+                with state_lock:
+                    stats["rate_limited"] += 1
+                response, status = error(429, "Rate limit reached (fake server)", "rate_limit_exceeded")
+                response.headers["retry-after-ms"] = str(int(retry_after * 1000) + 1)
+                return response, status
+
+    @app.route("/v1/embeddings", methods=["POST"])
+    def embeddings():
+        data = request.get_json()
+        inputs = data.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+
+        items = []
+        for i, text in enumerate(inputs):
+            vector = fake_embedding(text, settings.embedding_dim)
+            if data.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode("ascii")
+            else:
+                embedding = vector.tolist()
+            items.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        tokens = sum(count_tokens(text) for text in inputs)
+        return jsonify({
+            "object": "list",
+            "data": items,
+            "model": data.get("model", ""),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+        })
+
+    @app.route("/v1/assistants", methods=["POST"])
+    def create_assistant():
+        data = request.get_json()
+        assistant = {
+            "id": new_id("asst"),
+            "object": "assistant",
+            "created_at": int(time.time()),
+            "name": data.get("name"),
+            "description": None,
+            "model": data.get("model", ""),
+            "instructions": data.get("instructions"),
+            "tools": data.get("tools", []),
+            "metadata": {},
+        }
+        with state_lock:
+            assistants[assistant["id"]] = assistant
+        return jsonify(assistant)
+
+    @app.route("/v1/threads", methods=["POST"])
+    def create_thread():
+        thread = {"id": new_id("thread"), "object": "thread", "created_at": int(time.time()), "metadata": {}}
+        with state_lock:
+            threads[thread["id"]] = []
+        return jsonify(thread)
+
+    @app.route("/v1/threads/<thread_id>/messages", methods=["POST"])
+    def create_message(thread_id):
+        if thread_id not in threads:
+            return error(404, f"No thread found with id '{thread_id}'.", "invalid_request_error")
+        data = request.get_json()
+        content = data.get("content", "")
+        if isinstance(content, list):
+            content = "".join(part.get("text", "") for part in content)
+        message = text_message(thread_id, data.get("role", "user"), content)
+        with state_lock:
+            threads[thread_id].append(message)
+        return jsonify(message)
+
+    @app.route("/v1/threads/<thread_id>/messages", methods=["GET"])
+    def list_messages(thread_id):
+        if thread_id not in threads:
+            return error(404, f"No thread found with id '{thread_id}'.", "invalid_request_error")
+        with state_lock:
+            messages = list(threads[thread_id])
+        if request.args.get("order", "desc") == "desc":
+            messages.reverse()
+        return jsonify({
+            "object": "list",
+            "data": messages,
+            "first_id": messages[0]["id"] if messages else None,
+            "last_id": messages[-1]["id"] if messages else None,
+            "has_more": False,
+        })
+
+    @app.route("/v1/threads/<thread_id>/runs", methods=["POST"])
+    def create_run(thread_id):
+        if thread_id not in threads:
+            return error(404, f"No thread found with id '{thread_id}'.", "invalid_request_error")
+        data = request.get_json()
+        run = {
+            "id": new_id("run"),
+            "object": "thread.run",
+            "created_at": int(time.time()),
+            "thread_id": thread_id,
+            "assistant_id": data.get("assistant_id"),
+            "status": "queued",
+            "model": "",
+            "instructions": "",
+            "tools": [],
+            "metadata": {},
+            "usage": None,
+        }
+        with state_lock:
+            runs[run["id"]] = {"run": run, "polls": 0}
+        return jsonify(run)
+
+    @app.route("/v1/threads/<thread_id>/runs/<run_id>", methods=["GET"])
+    def retrieve_run(thread_id, run_id):
+        with state_lock:
+            entry = runs.get(run_id)
+            if entry is None or entry["run"]["thread_id"] != thread_id:
+                return error(404, f"No run found with id '{run_id}'.", "invalid_request_error")
+            run = entry["run"]
+            entry["polls"] += 1
+            if run["status"] != "completed" and entry["polls"] >= settings.run_polls:
+                question = threads[thread_id][-1]["content"][0]["text"]["value"] if threads[thread_id] else ""
+                answer = f"Fake answer to: {question}"
+                threads[thread_id].append(
+                    text_message(thread_id, "assistant", answer, run["assistant_id"], run_id)
+                )
+                prompt_tokens, completion_tokens = count_tokens(question), count_tokens(answer)
+                run["status"] = "completed"
+                run["completed_at"] = int(time.time())
+                run["usage"] = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                }
+            elif run["status"] == "queued":
+                run["status"] = "in_progress"
+            return jsonify(run)
+
+    return app
+
+
+class FakeOpenAIServer:
+    """Runs the fake OpenAI app in a background thread (usable as a context manager)."""
+
+    def __init__(self, settings: FakeOpenAISettings = None, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings or FakeOpenAISettings()
+        self.app = create_app(self.settings)
+        self.server = make_server(host, port, self.app, threaded=True)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """Base URL to pass to the OpenAI client (includes /v1)."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self):
+        """Request counters: total requests and 429 responses."""
+        return dict(self.app.config["stats"])
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local fake OpenAI server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--rate-limit", type=float, default=0, help="Requests per second (0 = unlimited)")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--run-polls", type=int, default=1, help="Status polls before a run completes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = FakeOpenAISettings(args.latency, args.jitter, args.rate_limit,
+                                  args.embedding_dim, args.run_polls, args.seed)
+    print(f"Fake OpenAI server listening on http://{args.host}:{args.port}/v1")
+    create_app(settings).run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,137 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import yaml
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from benchmarks.fake_openai import FakeOpenAIServer, FakeOpenAISettings
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SCENARIOS = ("index", "search", "endpoints")
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(",") if v]
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite against a fake OpenAI server.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma separated scenarios to run ({', '.join(SCENARIOS)})")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=1536, help="Embedding dimension")
+
+    server = parser.add_argument_group("fake OpenAI server")
+    server.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API response")
+    server.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    server.add_argument("--rate-limit", type=float, default=0, help="Server requests per second (0 = unlimited)")
+    server.add_argument("--run-polls", type=int, default=1, help="Status polls before an assistant run completes")
+
+    client = parser.add_argument_group("analyzer config")
+    client.add_argument("--max-rate", type=float, default=1000, help="Client rate limiter max_rate")
+    client.add_argument("--time-period", type=float, default=1, help="Client rate limiter time_period")
+
+    scenario = parser.add_argument_group("scenarios")
+    scenario.add_argument("--repo-sizes", type=_int_list, default=[10, 100], help="Files per synthetic repo")
+    scenario.add_argument("--lines-per-file", type=int, default=200)
+    scenario.add_argument("--search-sizes", type=_int_list, default=[10_000, 100_000, 1_000_000],
+                          help="Vectors in the index (1M vectors at dim 1536 needs ~6 GB of RAM)")
+    scenario.add_argument("--queries", type=_positive_int, default=100, help="Queries per search size")
+    scenario.add_argument("--endpoint-vectors", type=int, default=10_000, help="Vectors behind /search")
+    scenario.add_argument("--endpoint-repeats", type=int, default=50, help="Requests per endpoint")
+    scenario.add_argument("--index-repeats", type=int, default=3, help="Requests to /index-repo")
+    scenario.add_argument("--index-files", type=int, default=10, help="Files in the repo indexed by /index-repo")
+    return parser.parse_args(argv)
+
+
+def write_config(workdir, args):
+    """Write the analyzer config used while benchmarking."""
+    config = {
+        "openai_api_key": "fake-key",
+        "vector_db": {"embedding_dim": args.dim, "chunk_size": 500},
+        "rate_limiter": {"max_rate": args.max_rate, "time_period": args.time_period},
+        "repository": {"root": str(workdir)},
+        "metrics": {"enabled": True},
+    }
+    path = Path(workdir) / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    selected = [s for s in args.scenarios.split(",") if s]
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    output = Path(args.output).resolve()
+    settings = FakeOpenAISettings(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                                  embedding_dim=args.dim, run_polls=args.run_polls, seed=args.seed)
+    cwd = os.getcwd()
+    saved_env = {name: os.environ.get(name) for name in ("REPO_ANALYZER_CONFIG", "OPENAI_BASE_URL")}
+    results = []
+    with tempfile.TemporaryDirectory() as workdir, FakeOpenAIServer(settings) as server:
+        os.environ["REPO_ANALYZER_CONFIG"] = str(write_config(workdir, args))
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.chdir(workdir)  # VectorStore reads and writes vectorstore.index in the working directory
+        try:
+            # Imported late: the analyzer reads its config and creates OpenAI clients on import
+            from benchmarks import scenarios
+
+            if "index" in selected:
+                results += scenarios.run_index(workdir, server, args.repo_sizes, args.dim,
+                                               args.lines_per_file, args.seed)
+            if "search" in selected:
+                results += scenarios.run_search(workdir, args.search_sizes, args.dim, args.queries, seed=args.seed)
+            if "endpoints" in selected:
+                results += scenarios.run_endpoints(workdir, args.endpoint_vectors, args.dim, args.endpoint_repeats,
+                                                   args.index_repeats, args.index_files, args.lines_per_file,
+                                                   args.seed)
+        finally:
+            os.chdir(cwd)
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {k: v for k, v in vars(args).items() if k != "output"},
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Wrote {len(results)} benchmark results to {output}")
+
+
+if __name__ == "__main__":
+    main()
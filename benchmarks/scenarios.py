@@ -0,0 +1,157 @@
+"""
+Benchmark scenarios. Importing this module imports the analyzer, which reads its
+config and creates its OpenAI clients, so benchmarks.run sets up the environment first.
+"""
+import time
+import asyncio
+import statistics
+import numpy as np
+from pathlib import Path
+from src.core.vectorstore import VectorStore
+from src.core.repository import RepositoryManager
+from src.utils import metrics
+from benchmarks.synthetic_repo import generate_repository
+
+
+def summarize_latencies(seconds):
+    """Return count, mean and percentile latencies (in milliseconds) of a list of durations."""
+    values = sorted(s * 1000 for s in seconds)
+    if not values:
+        return {"count": 0}
+
+    def percentile(p):
+        return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3),
+        "min": round(values[0], 3),
+        "p50": round(percentile(50), 3),
+        "p95": round(percentile(95), 3),
+        "p99": round(percentile(99), 3),
+        "max": round(values[-1], 3),
+    }
+
+
+def populated_store(num_vectors: int, dim: int, index_file, seed: int = 0, batch_size: int = 100_000):
+    """Create a VectorStore holding num_vectors deterministic random vectors."""
+    store = VectorStore(embedding_dim=dim, index_file=str(index_file))
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_vectors, batch_size):
+        count = min(batch_size, num_vectors - start)
+        store.index.add(rng.standard_normal((count, dim), dtype=np.float32))
+    store.metadata = [{"text": f"synthetic chunk {i}"} for i in range(num_vectors)]
+    return store
+
+
+def run_index(workdir, server, repo_sizes, dim: int, lines_per_file: int, seed: int = 0):
+    """
+    Index synthetic repositories with RepositoryManager.index_repository_files.
+    Files that fail to index (e.g. after exhausting 429 retries) are reported as "errors".
+    """
+    results = []
+    for num_files in repo_sizes:
+        repo_path = Path(workdir) / f"repo_{num_files}"
+        generate_repository(repo_path, num_files=num_files, lines_per_file=lines_per_file, seed=seed)
+        store = VectorStore(embedding_dim=dim, index_file=str(Path(workdir) / f"index_{num_files}.index"))
+        manager = RepositoryManager("synthetic", repo_path, store)
+
+        requests_before = server.stats
+        errors_before = metrics.value("indexing_errors_total")
+        with metrics.profiling() as spans:
+            start = time.perf_counter()
+            asyncio.run(manager.index_repository_files())
+            elapsed = time.perf_counter() - start
+        requests_after = server.stats
+        errors = metrics.value("indexing_errors_total") - errors_before
+        if errors:
+            print(f"WARNING: {errors} of {num_files} files failed to index; throughput is not comparable")
+
+        chunks = len(store.metadata)
+        results.append({
+            "scenario": "index",
+            "name": f"index_{num_files}_files",
+            "params": {"files": num_files, "lines_per_file": lines_per_file},
+            "elapsed_s": round(elapsed, 3),
+            "chunks": chunks,
+            "errors": errors,
+            "throughput": {
+                "files_per_s": round(num_files / elapsed, 3),
+                "chunks_per_s": round(chunks / elapsed, 3),
+            },
+            "api_requests": requests_after["requests"] - requests_before["requests"],
+            "rate_limited": requests_after["rate_limited"] - requests_before["rate_limited"],
+            "profile": metrics.summarize_profile(spans),
+        })
+    return results
+
+
+def run_search(workdir, sizes, dim: int, queries: int, top_k: int = 5, seed: int = 0):
+    """Measure VectorStore.search latency over indexes of the given sizes."""
+    results = []
+    for num_vectors in sizes:
+        store = populated_store(num_vectors, dim, Path(workdir) / "missing.index", seed=seed)
+
+        async def search_all():
+            await store.search("warmup", top_k=top_k)
+            latencies = []
+            for i in range(queries):
+                start = time.perf_counter()
+                await store.search(f"benchmark query {i}", top_k=top_k)
+                latencies.append(time.perf_counter() - start)
+            return latencies
+
+        with metrics.profiling() as spans:
+            latencies = asyncio.run(search_all())
+
+        results.append({
+            "scenario": "search",
+            "name": f"search_{num_vectors}",
+            "params": {"vectors": num_vectors, "dim": dim, "queries": queries, "top_k": top_k},
+            "latency_ms": summarize_latencies(latencies),
+            "throughput": {"queries_per_s": round(len(latencies) / sum(latencies), 3)} if latencies else {},
+            "profile": metrics.summarize_profile(spans),
+        })
+        del store
+    return results
+
+
+def run_endpoints(workdir, num_vectors: int, dim: int, repeats: int, index_repeats: int,
+                  index_files: int, lines_per_file: int, seed: int = 0):
+    """Measure the Flask endpoints through the test client (no network hop to Flask)."""
+    from src.api import endpoints
+
+    endpoints.vector_store = populated_store(num_vectors, dim, Path(workdir) / "missing.index", seed=seed)
+    # benchmarks.run sets repository.root to workdir, so /index-repo accepts this relative path
+    generate_repository(Path(workdir) / "endpoint_repo", num_files=index_files,
+                        lines_per_file=lines_per_file, seed=seed)
+
+    client = endpoints.app.test_client()
+    cases = [
+        ("endpoint_root", "GET", "/", None, repeats),
+        ("endpoint_search", "POST", "/search", {"query": "How are files chunked?"}, repeats),
+        ("endpoint_ask_assistant", "POST", "/ask-assistant", {"query": "What does the rate limiter do?"}, repeats),
+        ("endpoint_index_repo", "POST", "/index-repo", {"path": "endpoint_repo"}, index_repeats),
+        ("endpoint_metrics", "GET", "/metrics", None, repeats),
+    ]
+
+    results = []
+    for name, method, url, body, count in cases:
+        client.open(url, method=method, json=body)  # Warmup (creates the assistant on first use)
+        latencies, errors = [], 0
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+        if errors:
+            print(f"WARNING: {errors} of {count} requests to {url} failed")
+        results.append({
+            "scenario": "endpoints",
+            "name": name,
+            "params": {"method": method, "url": url, "requests": count, "vectors": num_vectors},
+            "latency_ms": summarize_latencies(latencies),
+            "errors": errors,
+        })
+    return results
@@ -0,0 +1,56 @@
+import random
+from pathlib import Path
+
+_WORDS = ["repository", "vector", "index", "chunk", "embedding", "query", "thread", "assistant",
+          "config", "limit", "search", "file", "token", "result", "metadata", "request"]
+
+
+def _python_file(rng, lines):
+    out = [f'"""Synthetic module {rng.randrange(10 ** 6)}."""', "import os", ""]
+    while len(out) < lines:
+        name = "_".join(rng.sample(_WORDS, 2))
+        arg = rng.choice(_WORDS)
+        out += [
+            f"def {name}_{len(out)}({arg}):",
+            f'    """Return the {rng.choice(_WORDS)} for {arg}."""',
+            f"    value = len(str({arg})) * {rng.randrange(100)}",
+            f"    if value > {rng.randrange(1000)}:",
+            f"        return os.path.join(str({arg}), '{rng.choice(_WORDS)}')",
+            "    return value",
+            "",
+        ]
+    return "\n".join(out[:lines]) + "\n"
+
+
+def _text_file(rng, lines, heading="#"):
+    out = [f"{heading} {' '.join(rng.sample(_WORDS, 3)).title()}", ""]
+    while len(out) < lines:
+        out.append(" ".join(rng.choice(_WORDS) for _ in range(rng.randrange(6, 14))) + ".")
+    return "\n".join(out[:lines]) + "\n"
+
+
+def generate_repository(path, num_files: int = 100, lines_per_file: int = 200, seed: int = 0):
+    """
+    Write a deterministic synthetic repository of .py, .md and .txt files.
+    :param path: Directory to create the files in.
+    :param num_files: Number of files to generate (spread across nested packages).
+    :param lines_per_file: Number of lines in every file.
+    :param seed: Random seed; the same arguments always produce the same tree.
+    :return: List of generated file paths.
+    """
+    rng = random.Random(seed)
+    root = Path(path)
+    files = []
+    for i in range(num_files):
+        directory = root / f"pkg_{i % 10}" / f"sub_{(i // 10) % 5}"
+        directory.mkdir(parents=True, exist_ok=True)
+        kind = i % 5
+        if kind < 3:
+            file, content = directory / f"module_{i}.py", _python_file(rng, lines_per_file)
+        elif kind == 3:
+            file, content = directory / f"README_{i}.md", _text_file(rng, lines_per_file)
+        else:
+            file, content = directory / f"notes_{i}.txt", _text_file(rng, lines_per_file, heading="==")
+        file.write_text(content)
+        files.append(file)
+    return files
@@ -3,17 +3,64 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
 from src.core.vectorstore import VectorStore
+from src.core.repository import RepositoryManager
 from src.core.assistant import OpenAIAssistant
+from src.utils import metrics
+from src.utils.config import get_repository_root, get_assistant_config
 import asyncio
+import threading
+import time
 
 # Initialize Flask app
 app = Flask(__name__)
 
 # Initialize the Vector Store and OpenAI Assistant
 vector_store = VectorStore()
-assistant = OpenAIAssistant()
+assistant = OpenAIAssistant(get_assistant_config()[0])
+# Flask serves requests on several threads; only the first one may create the Assistant
+_assistant_lock = threading.Lock()
+
+
+@app.before_request
+def start_request_timer():
+    """Start timing the request; enable span profiling if requested via ?profile=1 or X-Profile: 1."""
+    g.request_start = time.perf_counter()
+    if request.args.get("profile") == "1" or request.headers.get("X-Profile") == "1":
+        g.profile_token = metrics.start_profile()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record endpoint latency and attach the span profile to JSON responses when profiling."""
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.observe("http_request_duration_seconds", time.perf_counter() - g.request_start, endpoint=endpoint)
+    metrics.inc("http_requests_total", endpoint=endpoint, status=str(response.status_code))
+
+    token = g.pop("profile_token", None)
+    if token is not None:
+        spans = metrics.stop_profile(token)
+        if response.is_json:
+            body = response.get_json()
+            if isinstance(body, dict):
+                body["profile"] = metrics.summarize_profile(spans)
+                response.set_data(app.json.dumps(body))
+    return response
+
+
+@app.teardown_request
+def stop_request_profile(exc):
+    """Make sure profiling is switched off even if the request raised."""
+    token = g.pop("profile_token", None)
+    if token is not None:
+        metrics.stop_profile(token)
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Expose collected metrics in Prometheus text format."""
+    return Response(metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.route("/", methods=["GET"])
@@ -34,7 +81,7 @@ def search_vector_store():
         if not query:
             return jsonify({"error": "Query text is required"}), 400
 
-        results = vector_store.search(query, top_k=3)
+        results = asyncio.run(vector_store.search(query, top_k=3))  # Run async function in sync Flask environment
         return jsonify({"results": results}), 200
     except Exception as e:
         return jsonify({"error": f"Search failed: {str(e)}"}), 500
@@ -52,6 +99,9 @@ def ask_assistant():
         if not query:
             return jsonify({"error": "Query text is required"}), 400
 
+        with _assistant_lock:
+            if not assistant.assistant_id:
+                asyncio.run(assistant.create_assistant())
         response = asyncio.run(assistant.query(query))  # Run async function in sync Flask environment
         return jsonify({"response": response}), 200
     except Exception as e:
@@ -61,10 +111,28 @@ def ask_assistant():
 @app.route("/index-repo", methods=["POST"])
 def index_repository():
     """
-    Indexes the repository files into the FAISS vector store.
+    Indexes the files of a local repository checkout into the FAISS vector store.
+    The path is resolved against the configured repository root and must stay inside it.
     """
     try:
-        asyncio.run(vector_store.index_repository_files())  # Run async function in sync Flask environment
+        data = request.get_json(silent=True) or {}
+        path = data.get("path", "")
+
+        if not path:
+            return jsonify({"error": "Repository path is required"}), 400
+
+        root = get_repository_root()
+        if root is None:
+            return jsonify({"error": "Repository indexing is disabled (repository.root is not configured)"}), 403
+
+        repo_path = (root / path).resolve()
+        if repo_path != root and root not in repo_path.parents:
+            return jsonify({"error": "Repository path must be inside the configured repository root"}), 403
+        if not repo_path.is_dir():
+            return jsonify({"error": "Repository path does not exist"}), 404
+
+        repo_manager = RepositoryManager("", repo_path, vector_store)
+        asyncio.run(repo_manager.index_repository_files())  # Run async function in sync Flask environment
         return jsonify({"message": "Repository successfully indexed"}), 200
     except Exception as e:
         return jsonify({"error": f"Indexing failed: {str(e)}"}), 500
@@ -1,12 +1,19 @@
 import openai
 import asyncio
 import nest_asyncio  # for Interactive Environments (Pycharm,Vscode etc)
-from src.utils.rate_limiter import get_rate_limiter
-from src.utils.config import get_openai_key  # Load OpenAI API key from config
+from src.utils.rate_limiter import rate_limited
+from src.utils.config import get_openai_key, get_assistant_config  # Load OpenAI settings from config
+from src.utils import metrics
 
 nest_asyncio.apply()
-# Initialize OpenAI Async Client
-client = openai.AsyncOpenAI(api_key=get_openai_key())
+# Initialize OpenAI Async Client (event hooks count API calls, retries and 429s)
+client = openai.AsyncOpenAI(
+    api_key=get_openai_key(),
+    http_client=openai.DefaultAsyncHttpxClient(event_hooks=metrics.openai_event_hooks())
+)
+
+# Run statuses after which polling can stop without a response (requires_action: tools are not supported)
+FAILED_RUN_STATUSES = ("failed", "cancelled", "expired", "incomplete", "requires_action")
 
 
 class OpenAIAssistant:
@@ -17,7 +24,7 @@ class OpenAIAssistant:
 
     async def create_assistant(self):
         """Create an OpenAI Assistant (only needed once)."""
-        async with get_rate_limiter():
+        async with rate_limited():
             assistant = await client.beta.assistants.create(
                 name="Code Analysis Assistant",
                 instructions="You are a code analysis assistant. Help users understand and query repository code.",
@@ -29,16 +36,23 @@ class OpenAIAssistant:
 
     async def create_thread(self):
         """Create a new conversation thread."""
-        async with get_rate_limiter():
+        async with rate_limited():
             thread = await client.beta.threads.create()
         return thread.id
 
+    async def query(self, question: str):
+        """Ask a single question in a new thread, creating the assistant on first use."""
+        if not self.assistant_id:
+            await self.create_assistant()
+        thread_id = await self.create_thread()
+        return await self.ask_question(thread_id, question)
+
     async def ask_question(self, thread_id: str, question: str):
         """Send a query to the Assistant."""
         if not self.assistant_id:
             raise ValueError("Assistant has not been created yet!")
 
-        async with get_rate_limiter():
+        async with rate_limited():
             message = await client.beta.threads.messages.create(
                 thread_id=thread_id,
                 role="user",
@@ -49,26 +63,55 @@ class OpenAIAssistant:
         # Run the assistant to get a response
         return await self.run_assistant(thread_id)
 
-    async def run_assistant(self, thread_id: str):
-        """Run the assistant and fetch responses."""
-        async with get_rate_limiter:
+    async def run_assistant(self, thread_id: str, timeout: float = None):
+        """
+        Run the assistant and fetch responses.
+        :param timeout: Seconds to wait for the run to complete (defaults to assistant.run_timeout in config).
+        """
+        if timeout is None:
+            _, timeout = get_assistant_config()
+        async with rate_limited():
             run = await client.beta.threads.runs.create(
                 thread_id=thread_id,
                 assistant_id=self.assistant_id
             )
 
         # Wait for completion
-        while True:
-            async with get_rate_limiter:
-                run_status = await client.beta.threads.runs.retrieve(
-                    thread_id=thread_id, run_id=run.id
-                )
-            if run_status.status == "completed":
-                break
-            # TODO: elif handle more status codes
-            await asyncio.sleep(1)  # Polling delay
+        deadline = asyncio.get_running_loop().time() + timeout
+        with metrics.span("assistant_poll"):
+            while True:
+                async with rate_limited():
+                    run_status = await client.beta.threads.runs.retrieve(
+                        thread_id=thread_id, run_id=run.id
+                    )
+                metrics.inc("assistant_polls_total")
+                if run_status.status == "completed":
+                    break
+                if run_status.status in FAILED_RUN_STATUSES:
+                    if run_status.status == "requires_action":
+                        await self._cancel_run(thread_id, run.id)
+                    error = getattr(run_status, "last_error", None)
+                    raise RuntimeError(f"Assistant run {run_status.status}"
+                                       + (f": {error.message}" if error else ""))
+                if asyncio.get_running_loop().time() >= deadline:
+                    await self._cancel_run(thread_id, run.id)
+                    raise TimeoutError(f"Assistant run did not complete within {timeout} seconds")
+                await asyncio.sleep(1)  # Polling delay
+
+        usage = getattr(run_status, "usage", None)
+        if usage is not None:
+            metrics.inc("openai_tokens_total", usage.prompt_tokens, kind="prompt")
+            metrics.inc("openai_tokens_total", usage.completion_tokens, kind="completion")
 
         # Get messages
-        async with get_rate_limiter:
+        async with rate_limited():
             messages = await client.beta.threads.messages.list(thread_id=thread_id)
         return messages.data[0].content[0].text.value
+
+    async def _cancel_run(self, thread_id: str, run_id: str):
+        """Best-effort cancel of a run we stopped waiting for."""
+        try:
+            async with rate_limited():
+                await client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+        except openai.OpenAIError as e:
+            print(f"Failed to cancel run {run_id}: {e}")
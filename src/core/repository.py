@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from git import Repo, GitCommandError
 from src.core.vectorstore import VectorStore
 from src.utils.async_utils import file_chunker
+from src.utils import metrics
 
 
 async def shutdown(signal, loop):
@@ -22,16 +23,18 @@ async def shutdown(signal, loop):
             print(f"Error in task {task.get_name()}: {result}")
     loop.stop()
 
-if sys.platform != "win32":
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+
+def install_signal_handlers():
+    """
+    Route SIGINT/SIGTERM to shutdown() on the running event loop.
+    Must be called from inside the loop; not done on import so importers (e.g. the Flask API) keep default handling.
+    """
+    if sys.platform == "win32":
+        print("Skipping signal handlers on Windows (not supported).")
+        return
+    loop = asyncio.get_running_loop()
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, lambda sig=sig: asyncio.create_task(shutdown(sig, loop)))
-else:
-    print("Skipping signal handlers on Windows (not supported).")
 
 
 class RepositoryManager:
@@ -76,7 +79,8 @@ class RepositoryManager:
     async def index_repository_files(self):
         """Reads, chunks, and stores repository code into the FAISS vector database asynchronously."""
         print("Indexing repository files...")
-        files = self.list_files(extensions=[".py", ".md", ".txt"])  # Index only relevant files
+        with metrics.span("file_scan"):
+            files = self.list_files(extensions=[".py", ".md", ".txt"])  # Index only relevant files
         tasks = [self.process_file(file) for file in files]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -84,23 +88,26 @@ class RepositoryManager:
         for file, result in zip(files, results):
             if isinstance(result, Exception):
                 print(f"Error processing {file}: {result}")
-        await asyncio.to_thread(self.vector_store.save_index)
+        with metrics.span("faiss_save"):
+            await asyncio.to_thread(self.vector_store.save_index)
 
     async def process_file(self, file):
         """Process file asynchronously using async for."""
         try:
             file_extension = file.suffix
             chunk_number = 0
-            async for chunk in file_chunker(file, chunk_size=512):
+            async for chunk in metrics.timed_aiter("chunking", file_chunker(file, chunk_size=512)):
                 metadata = {
                     "text": chunk,
                     "filename": file.name,
                     "chunk_number": chunk_number,
                     "file_extension": file_extension,
                 }
-                await asyncio.to_thread(self.vector_store.add_text, chunk, metadata)
+                await self.vector_store.add_text(chunk, metadata)
                 chunk_number += 1
+            metrics.inc("indexed_files_total")
         except Exception as e:
+            metrics.inc("indexing_errors_total")
             print(f"Skipping {file}: {e}")
 
 
@@ -113,3 +120,12 @@ async def async_repo_manager(repo_url, clone_path, vector_store):
     finally:
         print(f"Closing repository: {repo_url}")
 
+
+async def main(repo_url: str, clone_path: str):
+    """Clone and index a repository from the command line."""
+    install_signal_handlers()
+    await RepositoryManager(repo_url, Path(clone_path), VectorStore()).clone_repository()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], sys.argv[2]))
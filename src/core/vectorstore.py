@@ -2,12 +2,16 @@ import faiss
 import numpy as np
 import openai
 from typing import List, Tuple
-from src.utils.rate_limiter import get_rate_limiter
+from src.utils.rate_limiter import rate_limited
 from src.utils.config import get_openai_key
+from src.utils import metrics
 
 
-# Initialize OpenAI client
-client = openai.AsyncOpenAI(api_key=get_openai_key())
+# Initialize OpenAI client (event hooks count API calls, retries and 429s)
+client = openai.AsyncOpenAI(
+    api_key=get_openai_key(),
+    http_client=openai.DefaultAsyncHttpxClient(event_hooks=metrics.openai_event_hooks())
+)
 
 
 class VectorStore:
@@ -22,30 +26,37 @@ class VectorStore:
 
     async def _get_embedding(self, text: str):
         """Get embeddings using OpenAI's correct async API client."""
-        async with get_rate_limiter():
-            response = await client.embeddings.create(
-                model="text-embedding-3-small",
-                input=[text]
-            )
-            return response.data[0].embedding
+        async with rate_limited():
+            with metrics.span("embedding_request"):
+                response = await client.embeddings.create(
+                    model="text-embedding-3-small",
+                    input=[text]
+                )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            metrics.inc("openai_tokens_total", usage.total_tokens, kind="embedding")
+        return response.data[0].embedding
 
     async def add_text(self, text: str, metadata: dict):
         """Convert text to an embedding and add it to the FAISS index."""
         embedding = await self._get_embedding(text)
         embedding = np.array(embedding).reshape(1, -1)
-        self.index.add(embedding)
+        with metrics.span("faiss_add"):
+            self.index.add(embedding)
         self.metadata.append(metadata)
+        metrics.inc("indexed_chunks_total")
 
     async def search(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
         """Find the top_k most similar code snippets to the query."""
         query_embedding = np.array(await self._get_embedding(query)).reshape(1, -1)
-        distances, indices = self.index.search(query_embedding, top_k)
+        with metrics.span("faiss_search"):
+            distances, indices = self.index.search(query_embedding, top_k)
 
         results = []
         for i in range(len(indices[0])):
             idx = indices[0][i]
-            if idx < len(self.metadata):  # Ensure index is valid
-                results.append((self.metadata[idx]["text"], distances[0][i]))
+            if 0 <= idx < len(self.metadata):  # Ensure index is valid (FAISS pads missing hits with -1)
+                results.append((self.metadata[idx]["text"], float(distances[0][i])))
         return results
 
     def save_index(self, path: str = "vectorstore.index"):
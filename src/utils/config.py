@@ -1,7 +1,11 @@
+import os
 import yaml
 from pathlib import Path
 
-CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "config.yaml"
+# REPO_ANALYZER_CONFIG overrides the default location (used by the benchmark suite)
+CONFIG_PATH = Path(os.environ.get(
+    "REPO_ANALYZER_CONFIG", Path(__file__).resolve().parents[2] / "config" / "config.yaml"
+))
 
 
 def load_config():
@@ -30,3 +34,24 @@ def get_vector_db_config():
     embedding_dim = config.get("vector_db", {}).get("embedding_dim", 1536)
     chunk_size = config.get("vector_db", {}).get("chunk_size", 500)
     return embedding_dim, chunk_size
+
+
+def get_assistant_config():
+    """Return assistant properties (assistant_id, run_timeout in seconds)."""
+    config = load_config()
+    assistant_id = config.get("assistant", {}).get("assistant_id") or None
+    run_timeout = config.get("assistant", {}).get("run_timeout", 120)
+    return assistant_id, run_timeout
+
+
+def get_repository_root():
+    """Return the directory /index-repo may index from, or None if not configured."""
+    config = load_config()
+    root = config.get("repository", {}).get("root")
+    return Path(root).resolve() if root else None
+
+
+def get_metrics_config():
+    """Return whether metrics collection is enabled (defaults to True)."""
+    config = load_config()
+    return bool(config.get("metrics", {}).get("enabled", True))
@@ -0,0 +1,257 @@
+import re
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from src.utils.config import get_metrics_config
+
+# Default latency buckets (seconds), matching the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_lock = threading.Lock()
+_counters = {}  # (name, labels) -> float
+_histograms = {}  # (name, labels) -> [bucket_counts, sum, count]
+_help = {}  # name -> (type, help text)
+
+# Resolved lazily from config on first use
+_enabled = None
+
+# OpenAI object IDs in URL paths, replaced so labels stay low-cardinality
+_OPENAI_ID = re.compile(r"\b(thread|run|msg|asst|step|file)_[A-Za-z0-9]+")
+
+# Per-request profile: a list of (span name, seconds) while profiling is active, else None
+_profile = ContextVar("profile", default=None)
+
+
+def is_enabled():
+    """Returns whether metrics collection is enabled in config."""
+    global _enabled
+    if _enabled is None:
+        _enabled = get_metrics_config()
+    return _enabled
+
+
+def set_enabled(enabled: bool):
+    """Enable or disable metrics collection at runtime."""
+    global _enabled
+    _enabled = enabled
+
+
+def reset():
+    """Clear all collected metrics."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+
+def describe(name: str, metric_type: str, help_text: str):
+    """Register the type and help text exposed for a metric."""
+    _help[name] = (metric_type, help_text)
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Increment a counter."""
+    if not is_enabled():
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def value(name: str, **labels):
+    """Return the current value of a counter (0 if never incremented)."""
+    with _lock:
+        return _counters.get(_key(name, labels), 0)
+
+
+def observe(name: str, value: float, **labels):
+    """Record a value in a histogram."""
+    if not is_enabled():
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [[0] * (len(DEFAULT_BUCKETS) + 1), 0.0, 0]
+        histogram[0][bisect_left(DEFAULT_BUCKETS, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+class _NullSpan:
+    """No-op span used when neither metrics nor profiling are active."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Times a block and records it in the span histogram and the active profile."""
+
+    def __init__(self, name, profile):
+        self.name = name
+        self.profile = profile
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        observe("span_duration_seconds", elapsed, span=self.name)
+        if self.profile is not None:
+            self.profile.append((self.name, elapsed))
+        return False
+
+
+def span(name: str):
+    """
+    Context manager timing a block of code.
+    Usable around both sync and async code (``with span("faiss_search"): ...``).
+    """
+    profile = _profile.get()
+    if profile is None and not is_enabled():
+        return _NULL_SPAN
+    return _Span(name, profile)
+
+
+async def timed_aiter(name: str, aiterable):
+    """Yield from an async iterable, timing each produced item as a span (excludes consumer time)."""
+    iterator = aiterable.__aiter__()
+    while True:
+        timer = span(name)
+        timer.__enter__()
+        try:
+            item = await iterator.__anext__()
+        except StopAsyncIteration:
+            return  # Exhaustion is not an item, so the span is dropped
+        timer.__exit__(None, None, None)
+        yield item
+
+
+def start_profile():
+    """Start collecting spans in the current context; returns a token for stop_profile."""
+    return _profile.set([])
+
+
+def stop_profile(token):
+    """Stop collecting spans and return the (name, seconds) pairs recorded since start_profile."""
+    spans = _profile.get()
+    _profile.reset(token)
+    return spans
+
+
+@contextmanager
+def profiling():
+    """Collect every span recorded in the current context; yields the list of (name, seconds)."""
+    token = start_profile()
+    try:
+        yield _profile.get()
+    finally:
+        stop_profile(token)
+
+
+def summarize_profile(spans):
+    """Aggregate profiled spans into {name: {"count": n, "total_ms": t}}."""
+    summary = {}
+    for name, elapsed in spans:
+        entry = summary.setdefault(name, {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += elapsed * 1000
+    for entry in summary.values():
+        entry["total_ms"] = round(entry["total_ms"], 3)
+    return summary
+
+
+def openai_event_hooks():
+    """
+    httpx event hooks counting OpenAI HTTP traffic.
+    Pass to ``openai.DefaultAsyncHttpxClient(event_hooks=...)`` so retries made
+    internally by the OpenAI client are counted too.
+    """
+    async def on_response(response):
+        request = response.request
+        endpoint = _OPENAI_ID.sub("{id}", request.url.path)
+        inc("openai_api_calls_total", endpoint=endpoint, status=str(response.status_code))
+        if response.status_code == 429:
+            inc("openai_rate_limited_total", endpoint=endpoint)
+        if request.headers.get("x-stainless-retry-count", "0") != "0":
+            inc("openai_retries_total", endpoint=endpoint)
+
+    return {"response": [on_response]}
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for k, v in items
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus():
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in _histograms.items())
+
+    lines = []
+    seen = set()
+
+    def header(name, default_type):
+        if name in seen:
+            return
+        seen.add(name)
+        metric_type, help_text = _help.get(name, (default_type, ""))
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    for (name, labels), value in counters:
+        header(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for (name, labels), (buckets, total, count) in histograms:
+        header(name, "histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(DEFAULT_BUCKETS + (float("inf"),), buckets):
+            cumulative += bucket_count
+            le = _format_value(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+describe("span_duration_seconds", "histogram", "Duration of instrumented code spans.")
+describe("http_request_duration_seconds", "histogram", "Latency of API requests per endpoint.")
+describe("http_requests_total", "counter", "API requests per endpoint and status code.")
+describe("indexed_chunks_total", "counter", "Chunks added to the vector store.")
+describe("indexed_files_total", "counter", "Repository files processed during indexing.")
+describe("indexing_errors_total", "counter", "Repository files skipped because indexing failed.")
+describe("openai_tokens_total", "counter", "Tokens reported as used by the OpenAI API.")
+describe("openai_api_calls_total", "counter", "HTTP responses received from the OpenAI API.")
+describe("openai_retries_total", "counter", "OpenAI API requests that were retries.")
+describe("openai_rate_limited_total", "counter", "OpenAI API responses with status 429.")
+describe("assistant_polls_total", "counter", "Run status polls made while waiting for the assistant.")
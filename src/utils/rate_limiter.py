@@ -1,6 +1,8 @@
 import asyncio
+from contextlib import asynccontextmanager
 from aiolimiter import AsyncLimiter
 from src.utils.config import get_rate_limiter_config
+from src.utils import metrics
 
 # Singleton instance
 _rate_limiter = None
@@ -11,4 +13,13 @@ def get_rate_limiter():
     if _rate_limiter is None:
         max_rate, time_period = get_rate_limiter_config()
         _rate_limiter = AsyncLimiter(max_rate=max_rate, time_period=time_period)
-    return _rate_limiter
\ No newline at end of file
+    return _rate_limiter
+
+
+@asynccontextmanager
+async def rate_limited():
+    """Acquire capacity from the global rate limiter, timing the wait as a span."""
+    limiter = get_rate_limiter()
+    with metrics.span("rate_limiter_wait"):
+        await limiter.acquire()
+    yield
@@ -0,0 +1,74 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.core.assistant import OpenAIAssistant
+
+
+@pytest.fixture
+def mock_client():
+    """OpenAI client mock whose run has id run_1 and whose thread holds one reply."""
+    client = MagicMock()
+    client.beta.threads.runs.create = AsyncMock(return_value=SimpleNamespace(id="run_1"))
+    client.beta.threads.runs.retrieve = AsyncMock()
+    client.beta.threads.runs.cancel = AsyncMock()
+    reply = SimpleNamespace(content=[SimpleNamespace(text=SimpleNamespace(value="42"))])
+    client.beta.threads.messages.list = AsyncMock(return_value=SimpleNamespace(data=[reply]))
+    with patch("src.core.assistant.client", client):
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_query_creates_assistant_once():
+    """Test query creates the assistant on first use and opens a new thread per question."""
+    assistant = OpenAIAssistant()
+
+    async def create_assistant():
+        assistant.assistant_id = "asst_1"
+        return assistant.assistant_id
+
+    with patch.object(assistant, "create_assistant", side_effect=create_assistant) as mock_create, \
+            patch.object(assistant, "create_thread", new_callable=AsyncMock, return_value="thread_1") as mock_thread, \
+            patch.object(assistant, "ask_question", new_callable=AsyncMock, return_value="answer") as mock_ask:
+        assert await assistant.query("first?") == "answer"
+        assert await assistant.query("second?") == "answer"
+
+    mock_create.assert_called_once()
+    assert mock_thread.await_count == 2
+    mock_ask.assert_awaited_with("thread_1", "second?")
+
+
+@pytest.mark.asyncio
+async def test_run_assistant_returns_reply_when_completed(mock_client):
+    """Test polling stops on completion and returns the latest message."""
+    mock_client.beta.threads.runs.retrieve.return_value = SimpleNamespace(status="completed", usage=None)
+
+    assert await OpenAIAssistant("asst_1").run_assistant("thread_1", timeout=10) == "42"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, cancels", [
+    ("failed", False), ("cancelled", False), ("expired", False), ("requires_action", True),
+])
+async def test_run_assistant_raises_on_terminal_status(mock_client, status, cancels):
+    """Test runs ending without completion raise instead of polling forever."""
+    mock_client.beta.threads.runs.retrieve.return_value = SimpleNamespace(
+        status=status, last_error=SimpleNamespace(message="boom") if status == "failed" else None
+    )
+
+    with pytest.raises(RuntimeError, match=f"Assistant run {status}"):
+        await OpenAIAssistant("asst_1").run_assistant("thread_1", timeout=10)
+
+    assert mock_client.beta.threads.runs.retrieve.await_count == 1
+    assert mock_client.beta.threads.runs.cancel.called == cancels
+
+
+@pytest.mark.asyncio
+async def test_run_assistant_times_out(mock_client):
+    """Test a run that never finishes is cancelled after the timeout."""
+    mock_client.beta.threads.runs.retrieve.return_value = SimpleNamespace(status="in_progress")
+
+    with patch("src.core.assistant.asyncio.sleep", new_callable=AsyncMock):
+        with pytest.raises(TimeoutError):
+            await OpenAIAssistant("asst_1").run_assistant("thread_1", timeout=0)
+
+    mock_client.beta.threads.runs.cancel.assert_awaited_once_with(thread_id="thread_1", run_id="run_1")
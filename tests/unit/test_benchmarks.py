@@ -0,0 +1,102 @@
+import pytest
+import base64
+import numpy as np
+from benchmarks.synthetic_repo import generate_repository
+from benchmarks.compare import compare
+from benchmarks.fake_openai import FakeOpenAISettings, create_app, fake_embedding
+from benchmarks.run import parse_args
+
+
+def test_generate_repository_is_deterministic(tmp_path):
+    """Test the synthetic repository has the requested shape and is reproducible."""
+    first = generate_repository(tmp_path / "a", num_files=12, lines_per_file=30, seed=7)
+    second = generate_repository(tmp_path / "b", num_files=12, lines_per_file=30, seed=7)
+
+    assert len(first) == 12
+    assert {f.suffix for f in first} == {".py", ".md", ".txt"}
+    assert all(len(f.read_text().splitlines()) == 30 for f in first)
+    assert [f.read_text() for f in first] == [f.read_text() for f in second]
+
+    compile(first[0].read_text(), str(first[0]), "exec")  # Generated Python is valid
+
+
+@pytest.mark.parametrize("current_p50, current_qps, expected", [
+    (10.5, 95.0, []),
+    (12.0, 100.0, [("search_10000", "latency_ms.p50", 10.0, 12.0)]),
+    (10.0, 80.0, [("search_10000", "throughput.queries_per_s", 100.0, 80.0)]),
+])
+def test_compare_flags_regressions(current_p50, current_qps, expected):
+    """Test that only slowdowns beyond the threshold are reported."""
+    def report(p50, qps):
+        return {"results": [{"name": "search_10000", "latency_ms": {"p50": p50, "p95": 20.0},
+                             "throughput": {"queries_per_s": qps}}]}
+
+    assert compare(report(10.0, 100.0), report(current_p50, current_qps), threshold=0.1) == expected
+
+
+def test_compare_flags_new_errors_and_missing_results():
+    """Test that failing requests and disappearing results count as regressions."""
+    baseline = {"results": [
+        {"name": "endpoint_search", "latency_ms": {"p50": 10.0}, "errors": 0},
+        {"name": "endpoint_metrics", "latency_ms": {"p50": 1.0}, "errors": 0},
+    ]}
+    current = {"results": [{"name": "endpoint_search", "latency_ms": {"p50": 2.0}, "errors": 5}]}
+
+    assert compare(baseline, current) == [
+        ("endpoint_metrics", "missing", "present", None),
+        ("endpoint_search", "errors", 0, 5),
+    ]
+
+
+def test_fake_embeddings_are_deterministic():
+    """Test embeddings depend only on the input text, in float and base64 encodings."""
+    client = create_app(FakeOpenAISettings(embedding_dim=8)).test_client()
+
+    first = client.post("/v1/embeddings", json={"input": ["alpha", "beta"], "model": "m"}).get_json()
+    second = client.post("/v1/embeddings", json={"input": ["alpha", "beta"], "model": "m"}).get_json()
+    encoded = client.post("/v1/embeddings", json={"input": "alpha", "encoding_format": "base64"}).get_json()
+
+    assert first["data"] == second["data"]
+    assert first["data"][0]["embedding"] != first["data"][1]["embedding"]
+    assert np.allclose(first["data"][0]["embedding"], fake_embedding("alpha", 8))
+    decoded = np.frombuffer(base64.b64decode(encoded["data"][0]["embedding"]), dtype=np.float32)
+    assert np.array_equal(decoded, fake_embedding("alpha", 8))
+    assert first["usage"]["total_tokens"] > 0
+
+
+def test_fake_server_rate_limit():
+    """Test requests beyond the token bucket get a 429 with retry-after-ms."""
+    client = create_app(FakeOpenAISettings(rate_limit=1, embedding_dim=8)).test_client()
+
+    assert client.post("/v1/embeddings", json={"input": "a"}).status_code == 200
+    response = client.post("/v1/embeddings", json={"input": "a"})
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after-ms"]) > 0
+    assert response.get_json()["error"]["type"] == "rate_limit_exceeded"
+
+
+def test_fake_run_lifecycle():
+    """Test a run is polled through in_progress to completed and then lists the assistant reply."""
+    client = create_app(FakeOpenAISettings(run_polls=3)).test_client()
+
+    assistant_id = client.post("/v1/assistants", json={"model": "gpt-4-turbo"}).get_json()["id"]
+    thread_id = client.post("/v1/threads", json={}).get_json()["id"]
+    client.post(f"/v1/threads/{thread_id}/messages", json={"role": "user", "content": "What is X?"})
+    run = client.post(f"/v1/threads/{thread_id}/runs", json={"assistant_id": assistant_id}).get_json()
+    assert run["status"] == "queued"
+
+    statuses = [client.get(f"/v1/threads/{thread_id}/runs/{run['id']}").get_json()["status"] for _ in range(3)]
+    assert statuses == ["in_progress", "in_progress", "completed"]
+
+    messages = client.get(f"/v1/threads/{thread_id}/messages").get_json()["data"]
+    assert messages[0]["role"] == "assistant"
+    assert "What is X?" in messages[0]["content"][0]["text"]["value"]
+    assert messages[1]["role"] == "user"
+
+
+def test_run_rejects_non_positive_queries():
+    """Test --queries below 1 is rejected before any benchmark runs."""
+    assert parse_args(["--queries", "1"]).queries == 1
+    with pytest.raises(SystemExit):
+        parse_args(["--queries", "0"])
@@ -0,0 +1,89 @@
+import pytest
+import signal
+import asyncio
+import threading
+from unittest.mock import patch, AsyncMock
+from src.api import endpoints
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the API."""
+    return endpoints.app.test_client()
+
+
+def test_import_keeps_default_signal_handling():
+    """Test importing the API does not install asyncio signal handlers (Ctrl+C / SIGTERM must still work)."""
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+
+
+def test_index_repo_requires_path(client):
+    """Test /index-repo rejects requests without a repository path."""
+    response = client.post("/index-repo", json={})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["../outside", "/etc"])
+def test_index_repo_rejects_paths_outside_root(client, tmp_path, path):
+    """Test /index-repo refuses paths that resolve outside the repository root."""
+    with patch.object(endpoints, "get_repository_root", return_value=tmp_path.resolve()):
+        response = client.post("/index-repo", json={"path": path})
+
+    assert response.status_code == 403
+
+
+def test_index_repo_disabled_without_root(client):
+    """Test /index-repo is disabled when no repository root is configured."""
+    with patch.object(endpoints, "get_repository_root", return_value=None):
+        response = client.post("/index-repo", json={"path": "repo"})
+
+    assert response.status_code == 403
+
+
+@patch("src.api.endpoints.RepositoryManager.index_repository_files", new_callable=AsyncMock)
+def test_index_repo_indexes_path_inside_root(mock_index, client, tmp_path):
+    """Test /index-repo indexes a directory inside the repository root."""
+    (tmp_path / "repo").mkdir()
+    with patch.object(endpoints, "get_repository_root", return_value=tmp_path.resolve()):
+        response = client.post("/index-repo", json={"path": "repo"})
+
+    assert response.status_code == 200
+    mock_index.assert_awaited_once()
+
+
+def test_search_awaits_vector_store(client):
+    """Test /search awaits VectorStore.search and returns its results."""
+    with patch.object(endpoints.vector_store, "search", new_callable=AsyncMock) as mock_search:
+        mock_search.return_value = [("def hello(): pass", 0.5)]
+        response = client.post("/search", json={"query": "hello"})
+
+    assert response.status_code == 200
+    assert response.get_json()["results"] == [["def hello(): pass", 0.5]]
+    mock_search.assert_awaited_once_with("hello", top_k=3)
+
+
+def test_concurrent_first_questions_create_one_assistant(client):
+    """Test concurrent first requests to /ask-assistant create a single Assistant."""
+    async def create_assistant():
+        await asyncio.sleep(0.05)
+        endpoints.assistant.assistant_id = "asst_1"
+
+    with patch.object(endpoints.assistant, "assistant_id", None), \
+            patch.object(endpoints.assistant, "create_assistant", side_effect=create_assistant) as mock_create, \
+            patch.object(endpoints.assistant, "query", new_callable=AsyncMock, return_value="answer"):
+        statuses = []
+        threads = [
+            threading.Thread(target=lambda: statuses.append(
+                endpoints.app.test_client().post("/ask-assistant", json={"query": "hi"}).status_code
+            ))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert statuses == [200] * 4
+    mock_create.assert_called_once()
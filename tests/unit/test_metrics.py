@@ -0,0 +1,156 @@
+import pytest
+import asyncio
+import httpx
+from unittest.mock import patch, MagicMock
+from src.utils import metrics
+from src.api import endpoints
+
+
+@pytest.fixture(autouse=True)
+def enabled_metrics():
+    """Start every test with an empty, enabled registry."""
+    metrics.set_enabled(True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_counters_and_labels():
+    """Test counters accumulate separately per label set."""
+    metrics.inc("openai_api_calls_total", endpoint="/v1/embeddings", status="200")
+    metrics.inc("openai_api_calls_total", endpoint="/v1/embeddings", status="200")
+    metrics.inc("openai_api_calls_total", endpoint="/v1/embeddings", status="429")
+
+    output = metrics.render_prometheus()
+    assert "# TYPE openai_api_calls_total counter" in output
+    assert 'openai_api_calls_total{endpoint="/v1/embeddings",status="200"} 2' in output
+    assert 'openai_api_calls_total{endpoint="/v1/embeddings",status="429"} 1' in output
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram output follows the Prometheus bucket format."""
+    metrics.observe("http_request_duration_seconds", 0.02, endpoint="/search")
+    metrics.observe("http_request_duration_seconds", 3.0, endpoint="/search")
+
+    output = metrics.render_prometheus()
+    assert 'http_request_duration_seconds_bucket{endpoint="/search",le="0.01"} 0' in output
+    assert 'http_request_duration_seconds_bucket{endpoint="/search",le="0.025"} 1' in output
+    assert 'http_request_duration_seconds_bucket{endpoint="/search",le="+Inf"} 2' in output
+    assert 'http_request_duration_seconds_count{endpoint="/search"} 2' in output
+    assert 'http_request_duration_seconds_sum{endpoint="/search"} 3.02' in output
+
+
+def test_disabled_metrics_record_nothing():
+    """Test that disabled metrics skip recording and spans are no-ops."""
+    metrics.set_enabled(False)
+    metrics.inc("indexed_chunks_total")
+    with metrics.span("faiss_add"):
+        pass
+
+    assert metrics.span("faiss_add") is metrics._NULL_SPAN
+    assert metrics.render_prometheus().strip() == ""
+
+
+def test_profiling_collects_spans_when_disabled():
+    """Test per-request profiling works independently of the global switch."""
+    metrics.set_enabled(False)
+    with metrics.profiling() as spans:
+        with metrics.span("embedding_request"):
+            pass
+        with metrics.span("embedding_request"):
+            pass
+
+    summary = metrics.summarize_profile(spans)
+    assert summary["embedding_request"]["count"] == 2
+    assert metrics.span("embedding_request") is metrics._NULL_SPAN  # Profiling switched off again
+
+
+def test_profiling_follows_async_tasks():
+    """Test spans recorded in tasks and threads end up in the caller's profile."""
+    def blocking():
+        with metrics.span("faiss_add"):
+            pass
+
+    async def work():
+        with metrics.span("faiss_search"):
+            await asyncio.sleep(0)
+        await asyncio.to_thread(blocking)
+
+    with metrics.profiling() as spans:
+        asyncio.run(work())
+
+    assert [name for name, _ in spans] == ["faiss_search", "faiss_add"]
+
+
+@pytest.mark.asyncio
+async def test_timed_aiter():
+    """Test timed_aiter yields every item and records one span per item (not for exhaustion)."""
+    async def numbers():
+        for i in range(3):
+            yield i
+
+    items = [i async for i in metrics.timed_aiter("chunking", numbers())]
+
+    assert items == [0, 1, 2]
+    assert 'span_duration_seconds_count{span="chunking"} 3' in metrics.render_prometheus()
+
+
+def test_openai_event_hooks_count_calls_429s_and_retries():
+    """Test the httpx hook counts API calls, 429s and retries with IDs stripped from the path."""
+    request = httpx.Request(
+        "GET", "https://api.openai.com/v1/threads/thread_abc123/runs/run_def456",
+        headers={"x-stainless-retry-count": "1"},
+    )
+    response = httpx.Response(429, request=request)
+
+    on_response = metrics.openai_event_hooks()["response"][0]
+    asyncio.run(on_response(response))
+
+    output = metrics.render_prometheus()
+    endpoint = 'endpoint="/v1/threads/{id}/runs/{id}"'
+    assert f'openai_api_calls_total{{{endpoint},status="429"}} 1' in output
+    assert f"openai_rate_limited_total{{{endpoint}}} 1" in output
+    assert f"openai_retries_total{{{endpoint}}} 1" in output
+    assert "thread_abc123" not in output
+
+
+@pytest.fixture
+def api_client():
+    """Flask test client with a vector store whose search records a span."""
+    async def search(query, top_k=5):
+        with metrics.span("faiss_search"):
+            return [("def hello(): pass", 0.5)]
+
+    vector_store = MagicMock()
+    vector_store.search = search
+    with patch.object(endpoints, "vector_store", vector_store):
+        yield endpoints.app.test_client()
+
+
+def test_metrics_endpoint_serves_prometheus_text(api_client):
+    """Test /metrics returns Prometheus text with requests labelled by route rule."""
+    api_client.post("/search", json={"query": "hello"})
+    response = api_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain")
+    body = response.get_data(as_text=True)
+    assert "# TYPE http_requests_total counter" in body
+    assert 'http_requests_total{endpoint="/search",status="200"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="/search"} 1' in body
+
+
+@pytest.mark.parametrize("url, headers", [("/search?profile=1", {}), ("/search", {"X-Profile": "1"})])
+def test_profile_switch_adds_profile(api_client, url, headers):
+    """Test ?profile=1 and X-Profile: 1 attach the span profile to JSON responses."""
+    response = api_client.post(url, json={"query": "hello"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()["profile"]["faiss_search"]["count"] == 1
+
+
+def test_no_profile_by_default(api_client):
+    """Test responses are unchanged when profiling is not requested."""
+    response = api_client.post("/search", json={"query": "hello"})
+
+    assert "profile" not in response.get_json()
@@ -88,3 +88,17 @@ def test_save_and_load_index(mock_read, mock_write, vector_store):
 
     vector_store.load_index()
     mock_read.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_search_skips_missing_hits(tmp_path):
+    """Test FAISS -1 padding (fewer vectors than top_k) is not returned as a hit."""
+    store = VectorStore(embedding_dim=4, index_file=str(tmp_path / "missing.index"))
+    with patch.object(store, "_get_embedding", new_callable=AsyncMock, return_value=[0.1] * 4):
+        assert await store.search("anything", top_k=3) == []
+
+        store.index.add(np.ones((1, 4), dtype=np.float32))
+        store.metadata.append({"text": "only chunk"})
+        results = await store.search("anything", top_k=3)
+
+    assert [text for text, _ in results] == ["only chunk"]